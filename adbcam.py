@@ -2,15 +2,28 @@
 
 import os
 import sys
+import argparse
+import json
 import signal
+import struct
 import subprocess
 import time
 import atexit
+import fcntl
+import termios
 import re
+import selectors
 import threading
 import queue
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
+try:
+    import pulsectl
+except ImportError:
+    pulsectl = None  # fall back to pactl
+
 # ========== CONFIGURATION ==========
 V4L2_DEVICE = "/dev/video0"
 CARD_LABEL = "AdbCam"
@@ -19,6 +32,8 @@ DEFAULT_FPS = "60"
 # Audio configuration
 VIRTUAL_MIC_SOURCE = "AdbCam"
 PIPE_PATH = "/tmp/adbcam_pipe"
+AUDIO_CHUNK_SIZE = 65536
+AUDIO_FRAME_SIZE = 4  # s16le, 2 channels
 
 # Available microphone sources
 MIC_SOURCES = {
@@ -29,53 +44,110 @@ MIC_SOURCES = {
     "5": ("mic-voice-communication", "Microphone tuned for voice communications (voice calls)")
 }
 
+# Resolutions listed first when selecting, in display order
+_COMMON_RES = ('1920x1080', '1280x720', '640x480', '1920x1440', '2560x1440', '3840x2160')
+_COMMON_RES_SET = frozenset(_COMMON_RES)
+
+# scrcpy --list-camera-sizes output
+_CAMERA_RE = re.compile(r'^[ \t]*--camera-id=(\d+)\s+\(([^,]+),\s*(\d+x\d+),\s*fps=\[([^\]]+)\]\)', re.M)
+_RES_RE = re.compile(r'^[ \t]*-[ \t]*(\d+x\d+)[ \t\r]*$', re.M)
+
+# scrcpy log lines, in order of precedence; each branch is anchored with .*
+# so a single match() classifies the whole line
+_LOG_RE = re.compile(
+    r'(?P<disc>(?=.*WARN:).*Device disconnected)'
+    r'|(?P<noadb>.*Could not find any ADB device)'
+    r'|(?P<err>.*(?:ERROR:|FATAL:|Failed|Error|Cannot))'
+    r'|(?P<warn>.*WARN:)'
+    r'|(?P<ready>.*(?:v4l2 sink|Renderer:))'
+)
+# Cheap prefilter on the raw bytes, lines without any of these are never decoded
+_LOG_RE_BYTES = re.compile(rb'WARN:|ERROR:|FATAL:|Failed|Error|Cannot|Could not find any ADB device|v4l2 sink|Renderer:')
+# Longest partial line kept while waiting for its newline
+MAX_PENDING_OUTPUT = 65536
+
 # Global variables for cleanup
 MODULE_ID = None
+PULSE = None  # pulsectl connection, kept open to unload the module on cleanup
+PIPE_READER_FD = None  # keeps a reader on the FIFO so opening it for writing never blocks
 scrcpy_processes = []
 monitoring_threads = []
-device_disconnected = threading.Event()
+# Output pipes of all scrcpy processes, drained by a single monitor thread
+monitor_selector = selectors.EpollSelector()
+# Readable once the video process reports its sink or renderer is up
+video_ready_fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+# Device disconnection flag, readable once a disconnect is seen so main()
+# can block on it alongside the pidfds
+disconnect_fd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+
+def notify_disconnected():
+    """Flag the device as disconnected, waking up the main loop"""
+    os.eventfd_write(disconnect_fd, 1)
 
 # CLEANUP
 def cleanup():
+    global MODULE_ID, PULSE, PIPE_READER_FD
+    
     print("[*] Cleaning up...")
     
-    # Stop monitoring threads
-    for thread in monitoring_threads:
-        if thread.is_alive():
-            thread.daemon = True
+    # Terminate tracked processes through their pidfds, so only our own
+    # children are signalled even if a pid has been reused
+    for proc in scrcpy_processes:
+        try:
+            signal.pidfd_send_signal(proc._pidfd, signal.SIGTERM)
+        except OSError:
+            pass
+    
+    # Wait for all of them against one shared deadline, a pidfd is readable once its process exits
+    with selectors.EpollSelector() as sel:
+        for proc in scrcpy_processes:
+            sel.register(proc._pidfd, selectors.EVENT_READ)
+        
+        deadline = time.monotonic() + 2
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for key, _ in sel.select(timeout=remaining):
+                sel.unregister(key.fd)
+    
+    # Reap everything, killing whatever ignored SIGTERM
+    for proc in scrcpy_processes:
+        if proc.poll() is None:
+            try:
+                signal.pidfd_send_signal(proc._pidfd, signal.SIGKILL)
+            except OSError:
+                pass
+            proc.wait()
+        os.close(proc._pidfd)
+    scrcpy_processes.clear()
     
     # Unload PulseAudio module
-    if MODULE_ID:
+    if MODULE_ID is not None:
         try:
-            subprocess.run(["pactl", "unload-module", MODULE_ID], check=False, 
-                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if PULSE:
+                PULSE.module_unload(MODULE_ID)
+            else:
+                subprocess.run(["pactl", "unload-module", MODULE_ID], check=False, 
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except Exception as e:
             print(f"[!] Error unloading module: {e}")
+        MODULE_ID = None
+    
+    if PULSE:
+        PULSE.close()
+        PULSE = None
     
     # Remove pipe
+    if PIPE_READER_FD is not None:
+        os.close(PIPE_READER_FD)
+        PIPE_READER_FD = None
+    
     if os.path.exists(PIPE_PATH):
         try:
             os.remove(PIPE_PATH)
         except Exception as e:
             print(f"[!] Error removing pipe: {e}")
-    
-    # Kill scrcpy processes
-    try:
-        subprocess.run(["pkill", "-f", "scrcpy"], check=False,
-                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except Exception as e:
-        print(f"[!] Error killing scrcpy processes: {e}")
-    
-    # Terminate any tracked processes
-    for proc in scrcpy_processes:
-        try:
-            proc.terminate()
-            proc.wait(timeout=2)
-        except:
-            try:
-                proc.kill()
-            except:
-                pass
 
 def signal_handler(signum, frame):
     cleanup()
@@ -86,8 +158,22 @@ atexit.register(cleanup)
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
-def check_adb_devices() -> bool:
-    """Check if any ADB devices are connected"""
+def get_device_fingerprint(serial: str) -> Optional[str]:
+    """Get the build fingerprint of a device, None if it cannot be read"""
+    try:
+        result = subprocess.run(
+            ["adb", "-s", serial, "shell", "getprop", "ro.build.fingerprint"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=10
+        )
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+def check_adb_devices() -> List[str]:
+    """Return the serials of connected ADB devices"""
     print("[*] Checking for connected ADB devices...")
     try:
         result = subprocess.run(
@@ -111,121 +197,197 @@ def check_adb_devices() -> bool:
         
         if devices:
             print(f"[+] Found ADB device(s): {', '.join(devices)}")
-            return True
+            return devices
         else:
             print("[!] No ADB devices found in 'device' state")
-            return False
+            return []
             
     except subprocess.TimeoutExpired:
         print("[!] Timeout checking ADB devices")
-        return False
+        return []
     except subprocess.CalledProcessError as e:
         print(f"[!] Failed to check ADB devices: {e}")
         if e.stderr:
             print(f"[!] ADB Error: {e.stderr}")
-        return False
+        return []
     except FileNotFoundError:
         print("[!] ADB command not found. Please install Android Debug Bridge (adb)")
-        return False
+        return []
     except Exception as e:
         print(f"[!] Error checking ADB devices: {e}")
+        return []
+
+def handle_output_line(process_name, stream_name, line_str) -> bool:
+    """Report errors and disconnection warnings, return False to stop reading the stream"""
+    m = _LOG_RE.match(line_str)
+    if m is None:
+        return True
+    
+    kind = m.lastgroup
+    if kind == "disc":
+        print(f"[!] {process_name}: Device disconnected detected!")
+        notify_disconnected()
+        return False
+    elif kind == "noadb":
+        print(f"[!] {process_name}: No ADB device found!")
+        notify_disconnected()
         return False
+    elif kind == "err":
+        print(f"[!] {process_name} ({stream_name}): {line_str}")
+    elif kind == "warn":
+        print(f"[W] {process_name} ({stream_name}): {line_str}")
+    elif kind == "ready":
+        # The video server is up once the sink or renderer is reported
+        if process_name == "Video":
+            os.eventfd_write(video_ready_fd, 1)
+    return True
+
+def monitor_loop():
+    """Drain the output of every scrcpy process from a single thread"""
+    while True:
+        for key, _ in monitor_selector.select(timeout=None):
+            process_name, stream_name, pending = key.data
+            try:
+                chunk = os.read(key.fd, 65536)
+            except OSError as e:
+                print(f"[!] Error monitoring {process_name} {stream_name}: {e}")
+                chunk = b""
+            
+            eof = not chunk
+            if eof:
+                monitor_selector.unregister(key.fd)
+                if not pending:
+                    continue
+                # Terminate a final line without newline so it is still classified
+                chunk = b"\n"
+            
+            pending += chunk
+            end = pending.rfind(b"\n") + 1
+            
+            # Most chunks only hold routine output, skip those without splitting them into lines
+            if end and _LOG_RE_BYTES.search(pending, 0, end):
+                for line in pending[:end].split(b"\n"):
+                    if not line or line == b"\r" or not _LOG_RE_BYTES.search(line):
+                        continue
+                    
+                    line_str = line.decode("utf-8", "replace").rstrip()
+                    if not handle_output_line(process_name, stream_name, line_str):
+                        if not eof:
+                            monitor_selector.unregister(key.fd)
+                        break
+            
+            del pending[:end]
+            # Keep at most one bounded partial line, so a runaway line cannot grow it
+            if len(pending) > MAX_PENDING_OUTPUT:
+                pending.clear()
 
 def monitor_process_output(proc, process_name):
     """Monitor process output for errors and disconnection warnings"""
-    def read_stream(stream, stream_name):
-        try:
-            for line in iter(stream.readline, ''): 
-                if not line:
-                    break
-                
-                line_str = line.strip()
-                if not line_str:
-                    continue
-                
-                # Check for device disconnection
-                if "Device disconnected" in line_str and "WARN:" in line_str:
-                    print(f"[!] {process_name}: Device disconnected detected!")
-                    device_disconnected.set()
-                    return
-                
-                # Check for ADB device error
-                if "Could not find any ADB device" in line_str:
-                    print(f"[!] {process_name}: No ADB device found!")
-                    device_disconnected.set()
-                    return
-                
-                # Show errors and important warnings
-                if any(keyword in line_str for keyword in ["ERROR:", "FATAL:", "Failed", "Error", "Cannot"]):
-                    print(f"[!] {process_name} ({stream_name}): {line_str}")
-                elif "WARN:" in line_str and not "Device disconnected" in line_str:
-                    # Show other warnings but not device disconnected
-                    print(f"[W] {process_name} ({stream_name}): {line_str}")
-        except Exception as e:
-            print(f"[!] Error monitoring {process_name} {stream_name}: {e}")
-    
-    # Create threads for stdout and stderr
-    if proc.stdout:
-        stdout_thread = threading.Thread(target=read_stream, args=(proc.stdout, "stdout"), daemon=True)
-        stdout_thread.start()
-    
-    if proc.stderr:
-        stderr_thread = threading.Thread(target=read_stream, args=(proc.stderr, "stderr"), daemon=True)
-        stderr_thread.start()
+    # Register stdout and stderr with the shared monitor thread
+    for stream, stream_name in ((proc.stdout, "stdout"), (proc.stderr, "stderr")):
+        if stream:
+            monitor_selector.register(stream.fileno(), selectors.EVENT_READ,
+                                      (process_name, stream_name, bytearray()))
+    
+    if not monitoring_threads:
+        monitor_thread = threading.Thread(target=monitor_loop, daemon=True)
+        monitor_thread.start()
+        monitoring_threads.append(monitor_thread)
 
-def run_command(cmd, capture_output=False):
-    """Run a shell command and return the result"""
+def run_command(cmd: List[str], capture_output=False):
+    """Run a command without a shell and return the result"""
     try:
         if capture_output:
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, check=True)
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             return result.stdout.strip()
         else:
-            subprocess.run(cmd, shell=True, check=True, 
+            subprocess.run(cmd, check=True, 
                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             return True
-    except subprocess.CalledProcessError as e:
-        print(f"[!] Command failed: {cmd}")
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"[!] Command failed: {' '.join(cmd)}")
         print(f"[!] Error: {e}")
         return False
 
 def parse_camera_info(output: str) -> Dict[str, Dict]:
     """Parse the camera information from scrcpy --list-camera-sizes output"""
     cameras = {}
-    current_camera = None
+    matches = list(_CAMERA_RE.finditer(output))
     
-    lines = output.split('\n')
-    for line in lines:
-        line = line.strip()
+    for i, camera_match in enumerate(matches):
+        camera_id, camera_type, default_res, fps_range = camera_match.groups()
         
-        # Look for camera ID lines
-        camera_match = re.match(r'--camera-id=(\d+)\s+\(([^,]+),\s*(\d+x\d+),\s*fps=\[([^\]]+)\]\)', line)
-        if camera_match:
-            camera_id = camera_match.group(1)
-            camera_type = camera_match.group(2)
-            default_res = camera_match.group(3)
-            fps_range = camera_match.group(4)
-            
-            cameras[camera_id] = {
-                'type': camera_type,
-                'default_resolution': default_res,
-                'fps_range': fps_range,
-                'resolutions': []
-            }
-            current_camera = camera_id
+        # Resolution lines follow the camera line, up to the next camera
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(output)
+        cameras[camera_id] = {
+            'type': camera_type,
+            'default_resolution': default_res,
+            'fps_range': fps_range,
+            'resolutions': _RES_RE.findall(output, camera_match.end(), end)
+        }
+    
+    return cameras
+
+def _camera_cache_path() -> Path:
+    """Location of the on-disk camera information cache"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(cache_home) / "adbcam" / "cameras.json"
+
+def load_camera_cache() -> Dict[str, Dict]:
+    """Load cached camera information, keyed by device"""
+    try:
+        with open(_camera_cache_path()) as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_camera_cache(cache: Dict[str, Dict]):
+    """Write camera information back to the cache, failures are not fatal"""
+    path = _camera_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(cache, f)
+    except OSError as e:
+        print(f"[!] Could not write camera cache: {e}")
+
+def get_camera_info(serial: str, refresh: bool = False) -> Optional[Dict[str, Dict]]:
+    """Get camera information, from the cache when possible or from scrcpy"""
+    # Cache entries are keyed by "<serial>:<build fingerprint>"
+    cache = load_camera_cache()
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fingerprint_future = executor.submit(get_device_fingerprint, serial)
+        
+        # Without a usable cache entry for this serial the probe is needed whatever
+        # the fingerprint is, so run both concurrently
+        probe_future = None
+        if refresh or not any(key.startswith(f"{serial}:") for key in cache):
+            probe_future = executor.submit(probe_camera_info, serial)
         
-        # Look for resolution lines
-        elif current_camera and re.match(r'^\s*-\s*\d+x\d+\s*$', line):
-            resolution = line.strip('- ').strip()
-            cameras[current_camera]['resolutions'].append(resolution)
+        fingerprint = fingerprint_future.result()
+        cache_key = f"{serial}:{fingerprint}" if fingerprint else None
+        
+        if probe_future is None:
+            if cache_key in cache:
+                print("[*] Using cached camera information")
+                return cache[cache_key]
+            probe_future = executor.submit(probe_camera_info, serial)
+        
+        cameras = probe_future.result()
     
+    if cache_key and cameras:
+        cache[cache_key] = cameras
+        save_camera_cache(cache)
     return cameras
 
-def get_camera_info() -> Optional[Dict[str, Dict]]:
+def probe_camera_info(serial: str) -> Optional[Dict[str, Dict]]:
     """Get camera information from scrcpy"""
     print("[*] Getting camera information...")
     try:
         result = subprocess.run(
-            ["scrcpy", "--list-camera-sizes"],
+            ["scrcpy", "-s", serial, "--list-camera-sizes"],
             capture_output=True,
             text=True,
             check=True,
@@ -285,29 +447,29 @@ def select_camera(cameras: Dict[str, Dict]) -> Tuple[str, str, str]:
     print(f"\n[*] Available resolutions for camera {selected_camera} ({camera_info['type']}):")
     
     # easy selection for common res
-    common_resolutions = ['1920x1080', '1280x720', '640x480', '1920x1440', '2560x1440', '3840x2160']
-    other_resolutions = [r for r in resolutions if r not in common_resolutions]
+    resolution_set = frozenset(resolutions)
+    common_resolutions = [r for r in _COMMON_RES if r in resolution_set]
+    other_resolutions = [r for r in resolutions if r not in _COMMON_RES_SET]
     
     print("  Common resolutions:")
     for i, res in enumerate(common_resolutions):
-        if res in resolutions:
-            print(f"    {i+1}: {res}")
+        print(f"    {i+1}: {res}")
     
     if other_resolutions:
         print("  Other resolutions:")
-        start_idx = len([r for r in common_resolutions if r in resolutions]) + 1
+        start_idx = len(common_resolutions) + 1
         for i, res in enumerate(other_resolutions):
             print(f"    {start_idx + i}: {res}")
     
     # Select resolution
-    all_available = [r for r in common_resolutions if r in resolutions] + other_resolutions
+    all_available = common_resolutions + other_resolutions
     
     while True:
         try:
             res_input = input(f"\nSelect resolution (1-{len(all_available)}, default: 1920x1080): ").strip()
             
             if not res_input:
-                selected_resolution = "1920x1080" if "1920x1080" in resolutions else resolutions[0]
+                selected_resolution = "1920x1080" if "1920x1080" in resolution_set else resolutions[0]
                 break
             
             try:
@@ -374,16 +536,20 @@ def select_microphone_source() -> str:
 def check_v4l2loopback():
     """Check if v4l2loopback module is loaded"""
     try:
-        result = subprocess.run(["lsmod"], capture_output=True, text=True, check=True)
-        return "v4l2loopback" in result.stdout
-    except subprocess.CalledProcessError:
+        with open("/proc/modules") as f:
+            return any(line.startswith("v4l2loopback ") for line in f)
+    except OSError:
         return False
 
 def load_v4l2loopback():
     """Load the v4l2loopback module"""
+    # modprobe and the pactl fallback in setup_virtual_mic() stay separate argv commands:
+    # running them from one shell would bring back shell parsing of the labels. modprobe
+    # only runs when the module is missing, so the common path is one command either way
     if not check_v4l2loopback():
         print("[+] Loading v4l2loopback module...")
-        cmd = f'sudo modprobe v4l2loopback devices=1 video_nr=0 card_label="{CARD_LABEL}" exclusive_caps=1'
+        cmd = ["sudo", "modprobe", "v4l2loopback", "devices=1", "video_nr=0",
+               f"card_label={CARD_LABEL}", "exclusive_caps=1"]
         if not run_command(cmd):
             print("[!] Failed to load v4l2loopback module")
             return False
@@ -393,7 +559,7 @@ def load_v4l2loopback():
 
 def setup_virtual_mic():
     """Setup PulseAudio virtual microphone"""
-    global MODULE_ID
+    global MODULE_ID, PULSE, PIPE_READER_FD
     
     print(f"[+] Setting up PulseAudio virtual mic: {VIRTUAL_MIC_SOURCE}")
     
@@ -404,27 +570,52 @@ def setup_virtual_mic():
     # Create named pipe
     try:
         os.mkfifo(PIPE_PATH)
+        # Open the read end ourselves first, so the writer side never waits for PulseAudio
+        PIPE_READER_FD = os.open(PIPE_PATH, os.O_RDONLY | os.O_NONBLOCK)
     except OSError as e:
         print(f"[!] Failed to create pipe: {e}")
         return False
     
-    # Load PulseAudio module
-    cmd = f'pactl load-module module-pipe-source source_name="{VIRTUAL_MIC_SOURCE}" channels=2 format=s16le rate=48000 file="{PIPE_PATH}"'
-    try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, check=True)
-        MODULE_ID = result.stdout.strip()
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"[!] Failed to load PulseAudio module: {e}")
+    # Load PulseAudio module, in-process over the native protocol when pulsectl is available
+    module_args = [f"source_name={VIRTUAL_MIC_SOURCE}", "channels=2", "format=s16le",
+                   "rate=48000", f"file={PIPE_PATH}"]
+    if pulsectl:
+        try:
+            PULSE = pulsectl.Pulse("adbcam")
+            MODULE_ID = PULSE.module_load("module-pipe-source", module_args)
+            return True
+        except pulsectl.PulseError as e:
+            print(f"[!] Failed to load PulseAudio module: {e}")
+            return False
+    
+    output = run_command(["pactl", "load-module", "module-pipe-source", *module_args], capture_output=True)
+    if not output:
+        print("[!] Failed to load PulseAudio module")
         return False
+    
+    MODULE_ID = output
+    return True
+
+def track_process(proc):
+    """Open a pidfd for a new scrcpy process and track it for main() and cleanup()"""
+    try:
+        # pidfd becomes readable when the child exits, see main()
+        proc._pidfd = os.pidfd_open(proc.pid)
+    except OSError:
+        # An untracked process would never be stopped, so don't leave it running
+        proc.kill()
+        proc.wait()
+        raise
+    scrcpy_processes.append(proc)
 
-def start_scrcpy_video(camera_id: str, resolution: str, fps: str):
+def start_scrcpy_video(serial: str, camera_id: str, resolution: str, fps: str):
     """Start scrcpy for video capture"""
     print(f"[+] Starting scrcpy (video) -> {V4L2_DEVICE}")
     print(f"    Camera: {camera_id}, Resolution: {resolution}, FPS: {fps}")
     
     cmd = [
         "scrcpy",
+        "-s", serial,
         "--video-source=camera",
         f"--camera-id={camera_id}",
         "--no-audio",
@@ -439,39 +630,75 @@ def start_scrcpy_video(camera_id: str, resolution: str, fps: str):
         proc = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,  # This ensures strings instead of bytes
-            bufsize=1
+            stderr=subprocess.PIPE
         )
-        scrcpy_processes.append(proc)
+        track_process(proc)
         
-        # Start monitoring thread
-        monitor_thread = threading.Thread(
-            target=monitor_process_output,
-            args=(proc, "Video"),
-            daemon=True
-        )
-        monitor_thread.start()
-        monitoring_threads.append(monitor_thread)
+        # Start monitoring output
+        monitor_process_output(proc, "Video")
         
         return proc
     except Exception as e:
         print(f"[!] Failed to start scrcpy video: {e}")
         return None
 
-def start_scrcpy_audio(mic_source: str):
+def relay_audio(src_fd: int):
+    """Splice recorded audio into the FIFO, dropping chunks while its reader lags behind"""
+    try:
+        fifo_fd = os.open(PIPE_PATH, os.O_WRONLY | os.O_NONBLOCK)
+    except OSError as e:
+        print(f"[!] Failed to open audio pipe: {e}")
+        os.close(src_fd)
+        return
+    
+    try:
+        with selectors.DefaultSelector() as sel, selectors.DefaultSelector() as fifo_sel:
+            sel.register(src_fd, selectors.EVENT_READ)
+            fifo_sel.register(fifo_fd, selectors.EVENT_WRITE)
+            while True:
+                sel.select()
+                try:
+                    # Zero-copy, never blocks on a full FIFO
+                    if os.splice(src_fd, fifo_fd, AUDIO_CHUNK_SIZE, flags=os.SPLICE_F_NONBLOCK) == 0:
+                        break
+                except BlockingIOError:
+                    # FIFO is full, drop queued audio instead of stalling scrcpy. Only whole
+                    # frames are dropped, otherwise every later sample would be misaligned
+                    avail = struct.unpack("i", fcntl.ioctl(src_fd, termios.FIONREAD, b"\0" * 4))[0]
+                    if not avail:
+                        break  # readable with nothing queued is EOF
+                    
+                    drop = min(avail, AUDIO_CHUNK_SIZE) // AUDIO_FRAME_SIZE * AUDIO_FRAME_SIZE
+                    if drop:
+                        os.read(src_fd, drop)
+                    else:
+                        # Less than a frame queued, wait briefly for room rather than spin
+                        fifo_sel.select(timeout=0.01)
+    except BrokenPipeError:
+        pass  # FIFO reader went away during cleanup
+    except OSError as e:
+        print(f"[!] Audio relay stopped: {e}")
+    finally:
+        os.close(fifo_fd)
+        os.close(src_fd)
+
+def start_scrcpy_audio(serial: str, mic_source: str):
     """Start scrcpy for audio capture"""
     print(f"[+] Starting scrcpy (audio) -> {VIRTUAL_MIC_SOURCE}")
     print(f"    Microphone source: {mic_source}")
     
+    # scrcpy records into a private pipe, relay_audio() forwards it to the FIFO
+    audio_r, audio_w = os.pipe()
+    
     cmd = [
         "scrcpy",
+        "-s", serial,
         "--no-video",
         "--no-playback",
         f"--audio-source={mic_source}",
         "--audio-codec=raw",
         "--no-window",
-        f"--record={PIPE_PATH}",
+        f"--record=/dev/fd/{audio_w}",
         "--port", "27184",
         "--record-format=wav"
     ]
@@ -481,32 +708,35 @@ def start_scrcpy_audio(mic_source: str):
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,  # This ensures strings instead of bytes
-            bufsize=1
+            pass_fds=(audio_w,)
         )
-        scrcpy_processes.append(proc)
+        track_process(proc)
         
-        # Start monitoring thread
-        monitor_thread = threading.Thread(
-            target=monitor_process_output,
-            args=(proc, "Audio"),
-            daemon=True
-        )
-        monitor_thread.start()
-        monitoring_threads.append(monitor_thread)
+        # Start monitoring output and forwarding audio
+        monitor_process_output(proc, "Audio")
+        threading.Thread(target=relay_audio, args=(audio_r,), daemon=True).start()
         
         return proc
     except Exception as e:
         print(f"[!] Failed to start scrcpy audio: {e}")
+        os.close(audio_r)
         return None
+    finally:
+        os.close(audio_w)
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Use an Android device as a webcam and microphone")
+    parser.add_argument("--refresh-cameras", action="store_true",
+                        help="ignore cached camera information and query the device again")
+    args = parser.parse_args()
+    
     print("[*] AdbCam Setup - Enhanced Version")
     print("[*] =====================================")
     
     # First check for ADB devices
-    if not check_adb_devices():
+    serials = check_adb_devices()
+    if not serials:
         print("\n[!] SETUP FAILED: No ADB devices found")
         print("[*] Please ensure:")
         print("    1. Your Android device is connected via USB")
@@ -516,8 +746,11 @@ def main():
         print("\n[*] Try running 'adb devices' manually to troubleshoot")
         sys.exit(1)
     
+    # Every later command targets the first device explicitly
+    serial = serials[0]
+    
     # Get camera information
-    cameras = get_camera_info()
+    cameras = get_camera_info(serial, refresh=args.refresh_cameras)
     if cameras is None:
         print("\n[!] SETUP FAILED: Could not get camera information")
         print("[*] This usually means:")
@@ -555,15 +788,25 @@ def main():
         sys.exit(1)
     
     # Start scrcpy instances
-    video_proc = start_scrcpy_video(camera_id, resolution, fps)
+    video_proc = start_scrcpy_video(serial, camera_id, resolution, fps)
     if not video_proc:
         print("[!] Failed to start video capture")
         sys.exit(1)
     
-    # Wait a moment before starting audio to avoid port conflicts
-    time.sleep(2)
+    # Wait for the video server to come up before starting audio to avoid port conflicts,
+    # giving up early if the video process exits instead
+    with selectors.EpollSelector() as sel:
+        sel.register(video_ready_fd, selectors.EVENT_READ)
+        sel.register(video_proc._pidfd, selectors.EVENT_READ)
+        events = sel.select(timeout=5)
     
-    audio_proc = start_scrcpy_audio(mic_source)
+    if video_proc.poll() is not None:
+        print(f"[!] Video capture exited during startup (exit code: {video_proc.returncode})")
+        sys.exit(1)
+    if not events:
+        print("[W] Video capture did not report ready, starting audio anyway")
+    
+    audio_proc = start_scrcpy_audio(serial, mic_source)
     if not audio_proc:
         print("[!] Failed to start audio capture")
         sys.exit(1)
@@ -580,26 +823,37 @@ def main():
     print()
     
     # Wait for processes, user interrupt, or device disconnection
+    sel = selectors.EpollSelector()
+    sel.register(disconnect_fd, selectors.EVENT_READ)
+    for proc in scrcpy_processes:
+        sel.register(proc._pidfd, selectors.EVENT_READ, proc)
+    
     try:
-        while True:
-            #device disconnection
-            if device_disconnected.is_set():
-                print("[!] Device disconnection detected - stopping...")
-                break
-            
-            #process died
-            for proc in scrcpy_processes[:]:  # Create a copy of the list
-                if proc.poll() is not None:
-                    print(f"[!] A scrcpy process has terminated unexpectedly (exit code: {proc.returncode})")
-                    scrcpy_processes.remove(proc)
+        running = True
+        while running:
+            for key, _ in sel.select(timeout=None):
+                #device disconnection
+                if key.fd == disconnect_fd:
+                    print("[!] Device disconnection detected - stopping...")
+                    running = False
+                    break
+                
+                #process died
+                proc = key.data
+                sel.unregister(key.fd)
+                # Untrack before closing the pidfd, cleanup() may run from a signal handler
+                scrcpy_processes.remove(proc)
+                os.close(key.fd)
+                proc.wait()
+                print(f"[!] A scrcpy process has terminated unexpectedly (exit code: {proc.returncode})")
             
-            if not scrcpy_processes:
+            if running and not scrcpy_processes:
                 print("[!] All scrcpy processes have terminated")
-                break
-                
-            time.sleep(0.3)
+                running = False
     except KeyboardInterrupt:
         print("\n[*] Interrupted by user")
+    finally:
+        sel.close()
     
     cleanup()
 